@@ -1,26 +1,75 @@
 from torch.nn import Module, Sequential
 from typing import Callable
+import copy
+import itertools
+import numpy as np
 import random
+import torch
 
 
 class Augmentation(Module):
+    # Numbers the instances so that each one draws its own random stream
+    _instance_counter = itertools.count()
+
     def __init__(self, ratio: float):
         super().__init__()
         assert 0.0 <= ratio <= 1.0
 
         self.ratio = ratio
 
+        # Lazily created, see the rng property
+        self._rng = None
+        self._rng_seed = None
+        self._rng_id = next(Augmentation._instance_counter)
+
     def forward(self, x):
         return x
     
+    # Kept out of torch.compile graphs, where the draw would otherwise be traced once
+    @torch.compiler.disable
     def should_be_applied(self):
-        return random.random() <= self.ratio
+        """Drawn once per call, a batch given at once is augmented as a whole or not at all."""
+        return self.rng.random() <= self.ratio
+
+    @property
+    def rng(self) -> np.random.Generator:
+        """Random generator of the augmentation.
+
+        It is seeded from torch.initial_seed() and the instance number, without
+        consuming the torch generator, and is recreated whenever the torch seed
+        changes (e.g. in a new DataLoader worker, which torch seeds with
+        base_seed + worker_id). Each worker and each augmentation thus draws
+        its own stream.
+        """
+        seed = torch.initial_seed()
+
+        if self._rng is None or self._rng_seed != seed:
+            self._rng = np.random.default_rng(np.random.SeedSequence([seed, self._rng_id]))
+            self._rng_seed = seed
+
+        return self._rng
 
     def __copy__(self):
         newone = type(self)(self.ratio)
         newone.__dict__.update(self.__dict__)
+
+        newone._reset_rng()
+        return newone
+
+    def __deepcopy__(self, memo):
+        newone = type(self).__new__(type(self))
+        memo[id(self)] = newone
+        newone.__dict__.update(copy.deepcopy(self.__dict__, memo))
+
+        newone._reset_rng()
         return newone
 
+    def _reset_rng(self):
+        """Give a copy its own random stream instead of replaying the original one."""
+        self._rng = None
+        self._rng_seed = None
+        self._rng_id = next(Augmentation._instance_counter)
+
 
 class SignalAugmentation(Augmentation):
     def __init__(self, ratio):
@@ -41,48 +90,67 @@ class ComposeAugmentation:
     def __init__(self, pre_process_rule: Callable, post_process_rule: Callable, method='pick-one'):
         super().__init__()
         self.augmentation_pool = []
-        self.pre_process = []
         self.process = []
-        self.post_process = []
 
         self.pre_process_rule = pre_process_rule
         self.post_process_rule = post_process_rule
 
         self.method = method
 
+        # One composed Sequential and rule flags per augmentation of the pool
+        self._composed = []
+        self._pre_mask = np.zeros(0, dtype=np.bool_)
+        self._post_mask = np.zeros(0, dtype=np.bool_)
+
     def set_process(self, pool: list) -> None:
         self.process = pool
+        self._compose_all()
 
     def set_augmentation_pool(self, pool: list) -> None:
         self.augmentation_pool = pool
+        self._compose_all()
 
-    def __call__(self, x) -> Sequential:
-        self.pre_process = []
-        self.post_process = []
+    def share_memory(self) -> "ComposeAugmentation":
+        """Move the parameters and buffers of every augmentation and of the
+        process to shared memory, so that DataLoader workers use them instead of
+        their own copy.
+        """
+        for module in self._composed:
+            module.share_memory()
 
+        return self
+
+    def __call__(self, x) -> Sequential:
         if self.method == 'pick-one':
             return self._compose_pick_one()(x)
 
         else:
             raise ValueError(f'Methods {self.method} doesn\'t exist.')
 
-    def _compose_pick_one(self) -> Sequential:
-        """Select only one augmentation randomly."""
-        aug_idx = random.randint(0, len(self.augmentation_pool) - 1)
-        selected_aug = self.augmentation_pool[aug_idx]
+    def _compose_all(self) -> None:
+        """Build once the Sequential used for each augmentation of the pool."""
+        pool = self.augmentation_pool
+
+        # The rules are deterministic, evaluate them once per augmentation
+        self._pre_mask = np.fromiter((self.pre_process_rule(aug) for aug in pool), dtype=np.bool_, count=len(pool))
+        self._post_mask = np.fromiter((self.post_process_rule(aug) for aug in pool), dtype=np.bool_, count=len(pool))
 
-        # check pre-process rule
-        if self.pre_process_rule(selected_aug):
-            self.pre_process = [selected_aug]
+        # the process can be given as a module or as a list of modules
+        process = self.process if isinstance(self.process, Module) else Sequential(*self.process)
 
-        elif self.post_process_rule(selected_aug):
-            self.post_process = [selected_aug]
+        self._composed = []
+        for aug, is_pre, is_post in zip(pool, self._pre_mask, self._post_mask):
+            # pre-process rule takes precedence over the post-process one
+            pre_process = [aug] if is_pre else []
+            post_process = [aug] if is_post and not is_pre else []
 
-        # Compose the new sequential
-        composed = Sequential(
-            Sequential(*self.pre_process),
-            self.process,
-            Sequential(*self.post_process),
-        )
+            self._composed.append(Sequential(
+                Sequential(*pre_process),
+                process,
+                Sequential(*post_process),
+            ))
 
-        return composed
\ No newline at end of file
+    def _compose_pick_one(self) -> Sequential:
+        """Select only one augmentation randomly."""
+        aug_idx = random.randrange(len(self._composed))
+        return self._composed[aug_idx]
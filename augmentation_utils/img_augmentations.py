@@ -1,3 +1,4 @@
+import random
 import numpy as np
 import skimage.filters as filters
 import skimage.transform as transform
@@ -7,14 +8,16 @@ from skimage import exposure
 from .augmentations import ImgAugmentation
 
 
+_FILTERS = (Image.NEAREST, Image.BOX, Image.BILINEAR, Image.HAMMING, Image.BICUBIC)
+
+
 def random_interpolation():
     """
     Returns:
         a random interpolation filter for the Image library
     """
 
-    filters = [Image.NEAREST, Image.BOX, Image.BILINEAR, Image.HAMMING, Image.BICUBIC]
-    return np.random.choice(filters)
+    return _FILTERS[random.randrange(len(_FILTERS))]
 
 
 class Equalize(ImgAugmentation):
@@ -114,9 +117,9 @@ class Transform(ImgAugmentation):
         self.translation = translation
         
     def apply_helper(self, data):
-        scale = np.random.uniform(*self.scale)
-        rotation = np.random.uniform(*self.rotation)
-        translation = np.random.randint(*self.translation) if self.translation != (0,0) else 0
+        scale = self.rng.uniform(*self.scale)
+        rotation = self.rng.uniform(*self.rotation)
+        translation = self.rng.integers(*self.translation) if self.translation != (0,0) else 0
         
         tform = transform.SimilarityTransform(scale=scale, rotation=rotation, translation=translation)
         return transform.warp(data, tform)
@@ -12,7 +12,7 @@ class TimeStretch(SignalAugmentation):
         self.rate = rate
 
     def apply_helper(self, data):
-        rate = np.random.uniform(*self.rate)
+        rate = self.rng.uniform(*self.rate)
         output = librosa.effects.time_stretch(data, rate)
         return output
 
@@ -24,7 +24,7 @@ class PitchShiftRandom(SignalAugmentation):
         self.steps = steps
 
     def apply_helper(self, data):
-        nb_steps = np.random.uniform(*self.steps)
+        nb_steps = self.rng.uniform(*self.steps)
         output = librosa.effects.pitch_shift(data, sr=self.sampling_rate, n_steps=nb_steps)
         return output
 
@@ -36,7 +36,7 @@ class PitchShiftChoice(SignalAugmentation):
         self.choice = choice
 
     def apply_helper(self, data):
-        nb_steps = np.random.choice(self.choice)
+        nb_steps = self.rng.choice(self.choice)
         output = librosa.effects.pitch_shift(data, sr=self.sampling_rate, n_steps=nb_steps)
         return output
 
@@ -47,7 +47,7 @@ class Level(SignalAugmentation):
         self.rate = rate
 
     def apply_helper(self, data):
-        rate = np.random.uniform(*self.rate)
+        rate = self.rng.uniform(*self.rate)
         return rate*data
 
 
@@ -58,8 +58,8 @@ class Noise2(SignalAugmentation):
          self.noise_factor = noise_factor
 
      def apply_helper(self, data):
-         noise = np.random.randn(len(data))
-         noise_factor = np.random.uniform(*self.noise_factor)
+         noise = self.rng.standard_normal(len(data))
+         noise_factor = self.rng.uniform(*self.noise_factor)
          return data + noise_factor * noise
 
 
@@ -79,8 +79,10 @@ class Noise(SignalAugmentation):
         # calc scale factor
         k = 10 ** (t_snr / 10)
 
-        # noise
-        noise = np.random.normal(0, np.sqrt(k), size=len(data))
+        # noise, drawn in the signal precision to avoid upcasting float32 signals
+        dtype = np.float32 if data.dtype == np.float32 else np.float64
+        noise = self.rng.standard_normal(len(data), dtype=dtype)
+        noise *= np.sqrt(k)
 
         return data + noise
 
@@ -102,8 +104,8 @@ class _Occlusion(SignalAugmentation):
         if max_occlu_size > len(data):
             max_occlu_size = len(data) // 4
 
-        occlu_size = np.random.randint(0, max_occlu_size)
-        occlu_pos = np.random.randint(0, len(data) - occlu_size)
+        occlu_size = self.rng.integers(0, max_occlu_size)
+        occlu_pos = self.rng.integers(0, len(data) - occlu_size)
 
         cp_data = data.copy()
         cp_data[occlu_pos:occlu_pos + occlu_size] = 0
@@ -2,18 +2,178 @@ import numpy as np
 from .augmentations import SpecAugmentation
 import torch
 import torch.nn as nn
+import torch.nn.functional as F
 
-from PIL import Image
 
+_MODES = ('nearest', 'bilinear', 'bicubic')
 
-def random_interpolation():
+
+def random_interpolation(rng):
+    """
+    Args:
+        rng (np.random.Generator): the generator to draw from
+    Returns:
+        a random interpolation mode for torch.nn.functional.interpolate
     """
+
+    return _MODES[rng.integers(len(_MODES))]
+
+
+def _draw_chunks_width(rng, size, min_chunk_size, max_chunk_size):
+    """Draw random chunk widths until they cover size.
+
+    All the widths are drawn in a single call, enough of them to cover size
+    when every chunk has the minimum width.
+
     Returns:
-        a random interpolation filter for the Image library
+        an integer array of widths, the last one may overflow size
     """
+    nb_chunks = size // max(1, min_chunk_size) + 1
+    widths = rng.integers(min_chunk_size, max_chunk_size, size=nb_chunks)
+
+    # Only needed if the minimum width is 0
+    while widths.sum() < size:
+        widths = np.concatenate((widths, rng.integers(min_chunk_size, max_chunk_size, size=nb_chunks)))
+
+    return widths[:np.searchsorted(np.cumsum(widths), size) + 1]
+
+
+# Stretch rates are drawn among this many values so that the chunks sharing
+# the same rate can be resized together
+_NB_RATE_BUCKETS = 8
+
+
+def _stretch_chunks(rng, x, chunks_width, stretch_mask, rates):
+    """Stretch consecutive chunks along the last dimension.
+
+    The chunks sharing the same rate are replicate-padded to the same width and
+    resized with a single interpolate call, then cropped back. The resize uses
+    the rate itself as scale factor, so every chunk of a bucket gets the same
+    coordinate mapping as if it was resized alone to floor(width * rate), and
+    the replicate padding matches the border clamping of interpolate. A chunk
+    that would shrink below one line keeps its first line, as a nearest resize
+    to one line would. Every chunk is written directly at its place in the
+    output.
+
+    Args:
+        rng: the generator drawing the interpolation modes
+        x: tensor of shape (..., h, w)
+        chunks_width: width of each chunk, the last one may overflow w
+        stretch_mask: True for the chunks to stretch
+        rates: stretch rate of each chunk
+    Returns:
+        the concatenation of the (stretched) chunks, of shape (..., h, new_w)
+    """
+    lead = x.shape[:-2]
+    (h, w) = x.shape[-2:]
+    x = x.reshape(-1, h, w)
+
+    # Source and destination place of each chunk
+    offsets = np.cumsum(chunks_width) - chunks_width
+    widths = np.minimum(chunks_width, w - offsets)
+    scaled_widths = np.floor(widths * rates).astype(int)
+    tiny = stretch_mask & (scaled_widths == 0)
+    new_widths = np.where(stretch_mask, np.maximum(scaled_widths, 1), widths)
+    new_offsets = np.cumsum(new_widths) - new_widths
+
+    out = torch.empty((x.shape[0], h, int(new_widths.sum())), dtype=x.dtype, device=x.device)
+
+    # Copy at once the untouched chunks and the first line of the tiny ones
+    copy_widths = np.where(stretch_mask, tiny.astype(int), widths)
+    line = np.arange(copy_widths.sum()) - np.repeat(np.cumsum(copy_widths) - copy_widths, copy_widths)
+    src = np.repeat(offsets, copy_widths) + line
+    dst = np.repeat(new_offsets, copy_widths) + line
+    out[..., torch.from_numpy(dst).to(x.device)] = x[..., torch.from_numpy(src).to(x.device)]
+
+    for rate in np.unique(rates[stretch_mask & ~tiny]):
+        idx = np.flatnonzero(stretch_mask & ~tiny & (rates == rate))
+
+        max_width = widths[idx].max()
+
+        batch = torch.stack([
+            F.pad(x[..., offsets[i]:offsets[i]+widths[i]], (0, max_width - widths[i]), mode='replicate')
+            for i in idx
+        ])
+
+        stretched = F.interpolate(
+            batch,
+            scale_factor=(1.0, float(rate)),
+            recompute_scale_factor=False,
+            mode=random_interpolation(rng)
+        )
+
+        for j, i in enumerate(idx):
+            out[..., new_offsets[i]:new_offsets[i]+new_widths[i]] = stretched[j, ..., :new_widths[i]]
+
+    return out.reshape(*lead, h, -1)
 
-    filters = [Image.NEAREST, Image.BOX, Image.BILINEAR, Image.HAMMING, Image.BICUBIC]
-    return np.random.choice(filters)
+
+def _draw_drop_masks(rng, nb_masks, size, min_chunk_size, max_chunk_size, min_chunk, max_chunk):
+    """Split a dimension into random chunks and draw the ones to drop, for
+    several spectrograms at once.
+
+    Returns:
+        a boolean array of shape (nb_masks, size), True for the lines to drop
+    """
+    # Split the spectro into many small chunks (random size), enough of them to
+    # cover size when every chunk has the minimum width
+    nb_chunks = size // max(1, min_chunk_size) + 1
+    widths = rng.integers(min_chunk_size, max_chunk_size, size=(nb_masks, nb_chunks))
+
+    # Only needed if the minimum width is 0
+    while widths.sum(axis=1).min() < size:
+        widths = np.concatenate((widths, rng.integers(min_chunk_size, max_chunk_size, size=(nb_masks, nb_chunks))), axis=1)
+
+    starts = np.cumsum(widths, axis=1) - widths
+    used = starts < size
+
+    # Chunk of each line: the number of chunks started up to this line, minus one
+    rows, cols = np.nonzero(used)
+    chunk_starts = np.zeros((nb_masks, size), dtype=np.int64)
+    np.add.at(chunk_starts, (rows, starts[rows, cols]), 1)
+    line_chunk = np.cumsum(chunk_starts, axis=1) - 1
+
+    # select the chunks to drop among the used ones (with replacement)
+    nb_chunk_to_drop = rng.integers(min_chunk, max_chunk+1, size=nb_masks)
+    picked = (rng.random((nb_masks, max_chunk)) * used.sum(axis=1, keepdims=True)).astype(np.int64)
+    selected = np.arange(max_chunk) < nb_chunk_to_drop[:, None]
+
+    dropped = np.zeros(widths.shape, dtype=np.bool_)
+    dropped[np.nonzero(selected)[0], picked[selected]] = True
+
+    return np.take_along_axis(dropped, line_chunk, axis=1)
+
+
+def _resize(x, size):
+    """Antialiased bicubic resize of the last two dimensions, approximating LANCZOS.
+
+    The antialiased modes are not implemented for half precision on CPU, so
+    the resize is done in float32 and cast back.
+
+    Args:
+        x: tensor of shape (..., h, w)
+        size: the target (h, w)
+    """
+    work = x if x.dtype in (torch.float32, torch.float64) else x.float()
+    resized = F.interpolate(
+        work.reshape(1, -1, *x.shape[-2:]),
+        size=size,
+        mode='bicubic',
+        antialias=True
+    )
+
+    return resized.reshape(*x.shape[:-2], *size).to(x.dtype)
+
+
+def _drop_value(x, fill_value):
+    """
+    Returns:
+        fill_value if set, the minimum of each spectrogram of x otherwise
+    """
+    if fill_value is not None:
+        return fill_value
+
+    return x.amin(dim=(-2, -1), keepdim=True)
 
 
 class DropStripes(nn.Module):
@@ -35,31 +195,37 @@ class DropStripes(nn.Module):
     def forward(self, input):
         """input: (batch_size, channels, time_steps, freq_bins)"""
 
-        assert input.ndimension() == 3
+        assert input.dim() == 3
 
-        if self.training is False:
+        if not self.training:
             return input
 
         else:
             batch_size = input.shape[0]
             total_width = input.shape[self.dim]
 
-            for n in range(batch_size):
-                self.transform_slice(input[n], total_width)
+            mask = self.transform_slice(batch_size, total_width, input.device)
 
-            return input
+            if self.dim == 1:
+                mask = mask.unsqueeze(2)
+            elif self.dim == 2:
+                mask = mask.unsqueeze(1)
 
-    def transform_slice(self, e, total_width):
-        """e: (channels, time_steps, freq_bins)"""
+            return input.masked_fill_(mask, 0)
 
-        for _ in range(self.stripes_num):
-            distance = torch.randint(low=0, high=self.drop_width, size=(1,))[0]
-            bgn = torch.randint(low=0, high=total_width - distance, size=(1,))[0]
+    def transform_slice(self, batch_size: int, total_width: int, device: torch.device):
+        """Draw the stripes of the whole batch at once.
 
-            if self.dim == 1:
-                e[bgn: bgn + distance, :] = 0
-            elif self.dim == 2:
-                e[:, bgn: bgn + distance] = 0
+        Returns:
+            a boolean mask of shape (batch_size, total_width), True where dropped
+        """
+        distance = torch.randint(low=0, high=self.drop_width, size=(batch_size, self.stripes_num), device=device)
+        bgn = (torch.rand(batch_size, self.stripes_num, device=device) * (total_width - distance)).long()
+
+        idx = torch.arange(total_width, device=device)
+        mask = (idx >= bgn.unsqueeze(-1)) & (idx < (bgn + distance).unsqueeze(-1))
+
+        return mask.any(dim=1)
 
 
 class SpecAugment(nn.Module):
@@ -86,21 +252,32 @@ class SpecAugment(nn.Module):
         x = self.freq_dropper(x)
         return x
 
+    @classmethod
+    def scripted(cls, time_drop_width, time_stripes_num, freq_drop_width, freq_stripes_num):
+        """Spec augmentation compiled with torch.jit.script, same arguments as SpecAugment."""
+        return torch.jit.script(cls(time_drop_width, time_stripes_num, freq_drop_width, freq_stripes_num))
+
 
 class VerticalFlip(SpecAugmentation):
     def __init__(self, ratio):
         super().__init__(ratio)
 
-    def apply_helper(self, data):
-        return np.flipud(data).copy()
+    def forward(self, x):
+        if not self.should_be_applied():
+            return x
+
+        return torch.flip(x, dims=[-2])
 
 
 class HorizontalFlip(SpecAugmentation):
     def __init__(self, ratio):
         super().__init__(ratio)
 
-    def apply_helper(self, data):
-        return np.fliplr(data).copy()
+    def forward(self, x):
+        if not self.should_be_applied():
+            return x
+
+        return torch.flip(x, dims=[-1])
 
 
 class Noise(SpecAugmentation):
@@ -110,14 +287,16 @@ class Noise(SpecAugmentation):
         self.mini = mini
         self.maxi = maxi
 
-    def apply_helper(self, data):
+    def forward(self, x):
+        if not self.should_be_applied():
+            return x
+
         random_min = self.mini
         random_max = self.mini + self.snr
 
-        noise = np.random.uniform(random_min, random_max, size=data.shape)
-        noisy_data = data + noise
-        noisy_data = np.clip(noisy_data, self.mini, self.maxi)
-        return noisy_data.astype(np.float32)
+        # the noise inherits the dtype of x, and its buffer is reused for the output
+        noise = torch.empty_like(x).uniform_(random_min, random_max)
+        return noise.add_(x).clamp_(self.mini, self.maxi)
     
     
 class UniformSignNoise(SpecAugmentation):
@@ -127,13 +306,15 @@ class UniformSignNoise(SpecAugmentation):
         self.mini = mini
         self.maxi = maxi
         
-    def apply_helper(self, data):
+    def forward(self, x):
+        if not self.should_be_applied():
+            return x
+
         # generate uniform noise
-        noise = np.random.uniform(-1, 1, size=data.shape)
-        sign = np.sign(noise)
+        sign = torch.empty_like(x).uniform_(-1, 1).sign_()
         
-        perturbed = data + sign * self.epsilon
-        return np.clip(perturbed, self.mini, self.maxi)
+        perturbed = sign.mul_(self.epsilon).add_(x)
+        return perturbed.clamp_(self.mini, self.maxi)
 
 
 class FractalTimeStretch(SpecAugmentation):
@@ -146,6 +327,9 @@ class FractalTimeStretch(SpecAugmentation):
             rate (tuple): The min and max stretch value to use
             min_chunk_size (int): the minimum size of a column
             max_chunk_size (int): The maximum size of a column
+
+        For a batch (batch, freq, time), the chunks and their stretch rates are
+        drawn once and shared by all the spectrograms of the batch.
         """
         super().__init__(ratio)
 
@@ -157,55 +341,27 @@ class FractalTimeStretch(SpecAugmentation):
         self.intra_ratio = intra_ratio
         self.rate = rate
 
-    def apply_helper(self, data):
-        (h, w) = data.shape
+    def forward(self, x):
+        if not self.should_be_applied():
+            return x
+
+        (h, w) = x.shape[-2:]
 
         # Compute min and max column size if needed
-        self.min_chunk_size = int(w * 0.1) if self.min_chunk_size is None else self.min_chunk_size
-        self.max_chunk_size = int(w * 0.1) if self.max_chunk_size is None else self.max_chunk_size
+        min_cs = max(1, int(w * 0.01)) if self.min_chunk_size is None else self.min_chunk_size
+        max_cs = max(2, int(w * 0.1)) if self.max_chunk_size is None else self.max_chunk_size
 
         # Split the spectro into many small chunks (random size)
-        freq, temps = data.shape
-        chunks_width = []
-        chunks = []
-
-        while sum(chunks_width) < w:
-            width = np.random.randint(self.min_chunk_size, self.max_chunk_size)
-
-            current_index = sum(chunks_width)
-            chunks.append(data[:, current_index:current_index+width])
-
-            chunks_width.append(width)
+        chunks_width = _draw_chunks_width(self.rng, w, min_cs, max_cs)
 
         # Apply time stretch to each column (intra_ratio)
-        ratios = np.random.uniform(0, 1, len(chunks))
-        stretched_chunks = []
-
-        for ratio, width, column in zip(ratios, chunks_width, chunks):
-            if ratio <= self.intra_ratio:
-                rate = np.random.uniform(*self.rate)
-                column = Image.fromarray(column)
-
-                stretched_column = Image.Image.resize(
-                    column,
-                    (int(width * rate), h),
-                    random_interpolation()
-                )
-
-                stretched_chunks.append(np.array(stretched_column))
+        stretch_mask = self.rng.uniform(0, 1, len(chunks_width)) <= self.intra_ratio
+        rates = self.rng.choice(np.linspace(*self.rate, _NB_RATE_BUCKETS), size=len(chunks_width))
 
-            else:
-                stretched_chunks.append(column)
+        stretched_S = _stretch_chunks(self.rng, x, chunks_width, stretch_mask, rates)
 
         # Final resized to original dimension
-        stretched_S = np.concatenate(stretched_chunks, axis=1)
-
-        tmp = Image.fromarray(stretched_S)
-        tmp = Image.Image.resize(tmp, (temps, freq), Image.LANCZOS)
-
-        final_S = np.array(tmp)
-
-        return np.float32(final_S)
+        return _resize(stretched_S, (h, w))
 
 
 class FractalFreqStretch(SpecAugmentation):
@@ -218,6 +374,9 @@ class FractalFreqStretch(SpecAugmentation):
             rate (tuple): The min and max stretch value to use
             min_chunk_size (int): the minimum size of a column
             max_chunk_size (int): The maximum size of a column
+
+        For a batch (batch, freq, time), the chunks and their stretch rates are
+        drawn once and shared by all the spectrograms of the batch.
         """
         super().__init__(ratio)
 
@@ -229,55 +388,27 @@ class FractalFreqStretch(SpecAugmentation):
         self.intra_ratio = intra_ratio
         self.rate = rate
 
-    def apply_helper(self, data):
-        (h, w) = data.shape
+    def forward(self, x):
+        if not self.should_be_applied():
+            return x
+
+        (h, w) = x.shape[-2:]
 
         # Compute min and max chunk size if needed
-        self.min_chunk_size = int(h * 0.01) if self.min_chunk_size is None else self.min_chunk_size
-        self.max_chunk_size = int(h * 0.1) if self.max_chunk_size is None else self.max_chunk_size
+        min_cs = max(1, int(h * 0.01)) if self.min_chunk_size is None else self.min_chunk_size
+        max_cs = max(2, int(h * 0.1)) if self.max_chunk_size is None else self.max_chunk_size
 
         # Split the spectro into many small chunks (random size)
-        freq, temps = data.shape
-        chunk_width = []
-        chunks = []
-
-        while sum(chunk_width) < h:
-            width = np.random.randint(self.min_chunk_size, self.max_chunk_size)
-
-            current_index = sum(chunk_width)
-            chunks.append(data[current_index:current_index+width, :])
-
-            chunk_width.append(width)
+        chunks_width = _draw_chunks_width(self.rng, h, min_cs, max_cs)
 
         # Apply time stretch to each chunk (intra_ratio)
-        ratios = np.random.uniform(0, 1, len(chunks))
-        stretched_chunks = []
-
-        for ratio, width, chunk in zip(ratios, chunk_width, chunks):
-            if ratio <= self.intra_ratio:
-                rate = np.random.uniform(*self.rate)
-                chunk = Image.fromarray(chunk)
+        stretch_mask = self.rng.uniform(0, 1, len(chunks_width)) <= self.intra_ratio
+        rates = self.rng.choice(np.linspace(*self.rate, _NB_RATE_BUCKETS), size=len(chunks_width))
 
-                stretched_column = Image.Image.resize(
-                    chunk,
-                    (w, int(width * rate)),
-                    random_interpolation()
-                )
-
-                stretched_chunks.append(np.array(stretched_column))
-
-            else:
-                stretched_chunks.append(chunk)
+        stretched_S = _stretch_chunks(self.rng, x.transpose(-1, -2), chunks_width, stretch_mask, rates).transpose(-1, -2)
 
         # Final resized to original dimension
-        stretched_S = np.concatenate(stretched_chunks, axis=0)
-
-        tmp = Image.fromarray(stretched_S)
-        tmp = Image.Image.resize(tmp, (temps, freq), Image.LANCZOS)
-
-        final_S = np.array(tmp)
-
-        return np.float32(final_S)
+        return _resize(stretched_S, (h, w))
 
 
 class FractalStretch(SpecAugmentation):
@@ -286,17 +417,19 @@ class FractalStretch(SpecAugmentation):
             freq_min_chunk_size: int = None, freq_max_chunk_size: int = None,
             time_intra_ratio: float = 0.3, time_rate: tuple = (0.8, 1.2),
             time_min_chunk_size: int = None, time_max_chunk_size: int = None):
+        super().__init__(ratio)
         self.fts_func = FractalTimeStretch(ratio, time_intra_ratio, time_rate, time_min_chunk_size, time_max_chunk_size)
         self.ffs_func = FractalFreqStretch(ratio, freq_intra_ratio, freq_rate, freq_min_chunk_size, freq_max_chunk_size)
 
-    def apply_helper(self, data):
-        return self.fts_func(self.ffs_func(data))
+    def forward(self, x):
+        # Each stretch is applied independently with its own ratio
+        return self.fts_func(self.ffs_func(x))
 
 class FractalTimeDropout(SpecAugmentation):
     def __init__(self, ratio,
                  min_chunk_size: int = None, max_chunk_size: int = None,
                  min_chunk: int = 1, max_chunk: int = 3,
-                 void: bool = True):
+                 void: bool = True, fill_value: float = None):
         super().__init__(ratio)
 
         # This values, if set to None, will be automatically computed when needed
@@ -310,52 +443,36 @@ class FractalTimeDropout(SpecAugmentation):
         # ratio to apply or not the stretching on each columns (independantly)
         self.void = void
 
-    def apply_helper(self, data):
-        (h, w) = data.shape
-        mini = data.min()
+        # Value of the dropped chunks, if None the minimum of the spectrogram is used
+        self.fill_value = fill_value
 
-        # Compute min and max column size if needed
-        self.min_chunk_size = int(h * 0.01) if self.min_chunk_size is None else self.min_chunk_size
-        self.max_chunk_size = int(h * 0.1) if self.max_chunk_size is None else self.max_chunk_size
-        if self.min_chunk_size > self.max_chunk_size:
-            self.min_chunk_size, self.max_chunk_size = self.max_chunk_size, self.min_chunk_size
+    def forward(self, x):
+        if not self.should_be_applied():
+            return x
 
-        # Split the spectro into many small chunks (random size)
-        chunk_width = []
-        chunks = []
-
-        while sum(chunk_width) < w:
-            width = np.random.randint(self.min_chunk_size, self.max_chunk_size)
-
-            current_index = sum(chunk_width)
-            chunks.append(data[:, current_index:current_index+width])
-
-            chunk_width.append(width)
-
-        # create the valid mask to select the chunk to drop
-        valid_mask = np.ones(len(chunks))
-        nb_chunk_to_drop = np.random.randint(self.min_chunk, self.max_chunk+1)
-        
-        valid_mask[np.random.choice(range(len(chunks)), size=nb_chunk_to_drop)] = 0
+        (h, w) = x.shape[-2:]
+        mini = _drop_value(x, self.fill_value)
 
-        # reconstruct the signal using void or compacting it
-        reconstructed_S = []
-        for valid, chunk in zip(valid_mask, chunks):
-            if valid:
-                reconstructed_S.append(chunk)
-            else:
-                reconstructed_S.append(list(np.ones(chunk.shape) * mini))
+        # Compute min and max column size if needed
+        min_cs = max(1, int(w * 0.01)) if self.min_chunk_size is None else self.min_chunk_size
+        max_cs = max(2, int(w * 0.1)) if self.max_chunk_size is None else self.max_chunk_size
+        if min_cs > max_cs:
+            min_cs, max_cs = max_cs, min_cs
 
-        reconstructed_S = np.concatenate(reconstructed_S, axis=1)
+        # Draw the dropped chunks of each spectrogram of the batch independently
+        nb_spectro = int(np.prod(x.shape[:-2]))
+        mask = _draw_drop_masks(self.rng, nb_spectro, w, min_cs, max_cs, self.min_chunk, self.max_chunk)
 
-        return np.float32(reconstructed_S)
+        # reconstruct the signal, filling the dropped chunks with the minimum
+        mask = torch.from_numpy(mask).to(x.device).reshape(*x.shape[:-2], 1, w)
+        return torch.where(mask, mini, x)
 
 
 class FractalFrecDropout(SpecAugmentation):
     def __init__(self, ratio,
                  min_chunk_size: int = None, max_chunk_size: int = None,
                  min_chunk: int = 1, max_chunk: int = 3,
-                 void: bool = True):
+                 void: bool = True, fill_value: float = None):
         super().__init__(ratio)
 
         # These values, if set to None, will be automatically computed when needed
@@ -368,47 +485,29 @@ class FractalFrecDropout(SpecAugmentation):
         
         self.void = void
 
-    def apply_helper(self, data):
-        (h, w) = data.shape
-        mini = data.min()
-
-        # Compute min and max column size if needed
-        self.min_chunk_size = int(h * 0.1) if self.min_chunk_size is None else self.min_chunk_size
-        self.max_chunk_size = int(h * 0.1) if self.max_chunk_size is None else self.max_chunk_size
-        if self.min_chunk_size > self.max_chunk_size:
-            self.min_chunk_size, self.max_chunk_size = self.max_chunk_size, self.min_chunk_size
+        # Value of the dropped chunks, if None the minimum of the spectrogram is used
+        self.fill_value = fill_value
 
-        # Split the spectro into many small chunks (random size)
-        chunk_width = []
-        chunks = []
+    def forward(self, x):
+        if not self.should_be_applied():
+            return x
 
-        while sum(chunk_width) < h:
-            width = np.random.randint(self.min_chunk_size, self.max_chunk_size)
+        (h, w) = x.shape[-2:]
+        mini = _drop_value(x, self.fill_value)
 
-            current_index = sum(chunk_width)
-            chunks.append(data[current_index:current_index + width :])
-
-            chunk_width.append(width)
-
-        # create the valid mask to select the chunk to drop
-        valid_mask = np.ones(len(chunks))
-        nb_chunk_to_drop = np.random.randint(self.min_chunk, self.max_chunk+1)
-        
-        valid_mask[np.random.choice(range(len(chunks)), size=nb_chunk_to_drop)] = 0
-
-        # reconstruct the signal using void or compacting it
-        reconstructed_S = []
-        for valid, chunk in zip(valid_mask, chunks):
-            if valid:
-                reconstructed_S.append(chunk)
-                
-            else:
-                void = list(np.ones(chunk.shape) * mini)
-                reconstructed_S.append(void)
+        # Compute min and max column size if needed
+        min_cs = max(1, int(h * 0.01)) if self.min_chunk_size is None else self.min_chunk_size
+        max_cs = max(2, int(h * 0.1)) if self.max_chunk_size is None else self.max_chunk_size
+        if min_cs > max_cs:
+            min_cs, max_cs = max_cs, min_cs
 
-        reconstructed_S = np.concatenate(reconstructed_S, axis=0)
+        # Draw the dropped chunks of each spectrogram of the batch independently
+        nb_spectro = int(np.prod(x.shape[:-2]))
+        mask = _draw_drop_masks(self.rng, nb_spectro, h, min_cs, max_cs, self.min_chunk, self.max_chunk)
 
-        return np.float32(reconstructed_S)
+        # reconstruct the signal, filling the dropped chunks with the minimum
+        mask = torch.from_numpy(mask).to(x.device).reshape(*x.shape[:-2], h, 1)
+        return torch.where(mask, mini, x)
 
 
 class FractalDropout(SpecAugmentation):
@@ -416,51 +515,51 @@ class FractalDropout(SpecAugmentation):
             freq_min_chunk_size: int = None, freq_max_chunk_size: int = None,
             freq_min_chunk: int = 1, freq_max_chunk: int = 3, freq_void: bool = True,
             time_min_chunk_size: int = None, time_max_chunk_size: int = None,
-            time_min_chunk: int = 1, time_max_chunk: int = 3, time_void: bool = True    ):
+            time_min_chunk: int = 1, time_max_chunk: int = 3, time_void: bool = True,
+            fill_value: float = None):
+        super().__init__(ratio)
 
-        self.ratio = ratio
-        self.ftd_func = FractalTimeDropout(1.0, time_min_chunk_size, time_max_chunk_size, time_min_chunk, time_max_chunk, time_void)
-        self.ffd_func = FractalFrecDropout(1.0, freq_min_chunk_size, freq_max_chunk_size, freq_min_chunk, freq_max_chunk, freq_void)
+        self.ftd_func = FractalTimeDropout(1.0, time_min_chunk_size, time_max_chunk_size, time_min_chunk, time_max_chunk, time_void, fill_value)
+        self.ffd_func = FractalFrecDropout(1.0, freq_min_chunk_size, freq_max_chunk_size, freq_min_chunk, freq_max_chunk, freq_void, fill_value)
 
-    def apply_helper(self, data):
-        return self.ftd_func(self.ffd_func(data))
+    def forward(self, x):
+        if not self.should_be_applied():
+            return x
+
+        return self.ftd_func(self.ffd_func(x))
 
 
 class RandomTimeDropout(SpecAugmentation):
-    def __init__(self, ratio, dropout: float = 0.5):
+    def __init__(self, ratio, dropout: float = 0.5, fill_value: float = None):
         super().__init__(ratio)
 
         self.dropout = dropout
 
-    def apply_helper(self, data):
-        out = data.copy()
-
-        (h, w) = out.shape
-        mini = out.min()
-        valid_mask = [0 if x <= self.dropout else 1 for x in np.random.uniform(0, 1, size=w)]
+        # Value of the dropped lines, if None the minimum of the spectrogram is used
+        self.fill_value = fill_value
 
-        for valid, idx in zip(valid_mask, range(w-1)):
-            if not valid:
-                out[:, idx] = mini
+    def forward(self, x):
+        if not self.should_be_applied():
+            return x
 
-        return np.float32(out)
+        # one mask per spectrogram of the batch
+        mask = torch.rand(*x.shape[:-2], 1, x.shape[-1], device=x.device) <= self.dropout
+        return torch.where(mask, _drop_value(x, self.fill_value), x)
 
 
 class RandomFreqDropout(SpecAugmentation):
-    def __init__(self, ratio, dropout: float = 0.5):
+    def __init__(self, ratio, dropout: float = 0.5, fill_value: float = None):
         super().__init__(ratio)
 
         self.dropout = dropout
 
-    def apply_helper(self, data):
-        out = data.copy()
-
-        (h, w) = out.shape
-        mini = out.min()
-        valid_mask = [0 if x <= self.dropout else 1 for x in np.random.uniform(0, 1, size=h)]
+        # Value of the dropped lines, if None the minimum of the spectrogram is used
+        self.fill_value = fill_value
 
-        for valid, idx in zip(valid_mask, range(w-1)):
-            if not valid:
-                out[idx, :] = mini
+    def forward(self, x):
+        if not self.should_be_applied():
+            return x
 
-        return np.float32(out)
+        # one mask per spectrogram of the batch
+        mask = torch.rand(*x.shape[:-2], x.shape[-2], 1, device=x.device) <= self.dropout
+        return torch.where(mask, _drop_value(x, self.fill_value), x)
@@ -0,0 +1,143 @@
+import copy
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+import torch
+from torch.utils.data import DataLoader, Dataset
+
+from augmentation_utils.augmentations import ComposeAugmentation
+from augmentation_utils.spec_augmentations import FractalDropout, FractalTimeDropout
+
+
+class _SiblingDraws(Dataset):
+    def __init__(self):
+        self.aug = FractalDropout(1.0)
+
+    def __len__(self):
+        return 4
+
+    def __getitem__(self, idx):
+        return (
+            self.aug.ftd_func.rng.integers(0, 2**31, size=8),
+            self.aug.ffd_func.rng.integers(0, 2**31, size=8),
+        )
+
+
+def test_sibling_augmentations_draw_different_streams_in_workers():
+    loader = DataLoader(_SiblingDraws(), num_workers=2, batch_size=None)
+    draws = list(loader)
+
+    for time_draw, freq_draw in draws:
+        assert not torch.equal(time_draw, freq_draw)
+
+    # and the workers do not replay each other
+    assert not torch.equal(draws[0][0], draws[1][0])
+
+
+def test_sibling_augmentations_draw_different_streams():
+    a, b = FractalTimeDropout(1.0), FractalTimeDropout(1.0)
+    assert not np.array_equal(a.rng.integers(0, 2**31, size=8), b.rng.integers(0, 2**31, size=8))
+
+
+@pytest.mark.parametrize('copy_fn', [copy.copy, copy.deepcopy])
+def test_copy_draws_a_different_stream(copy_fn):
+    a = FractalTimeDropout(1.0)
+    a.rng  # create the generator before copying
+    b = copy_fn(a)
+    assert not np.array_equal(a.rng.integers(0, 2**31, size=8), b.rng.integers(0, 2**31, size=8))
+
+
+def test_deepcopy_copies_the_submodules_streams():
+    a = FractalDropout(1.0)
+    b = copy.deepcopy(a)
+    assert not np.array_equal(a.ftd_func.rng.integers(0, 2**31, size=8), b.ftd_func.rng.integers(0, 2**31, size=8))
+
+
+def test_rng_does_not_consume_the_torch_generator():
+    torch.manual_seed(0)
+    expected = torch.rand(4)
+
+    torch.manual_seed(0)
+    FractalTimeDropout(1.0).rng
+    assert torch.equal(torch.rand(4), expected)
+
+
+_SEEDED_RUN = """
+import random
+import numpy as np
+import torch
+from augmentation_utils.spec_augmentations import FractalTimeDropout, FractalTimeStretch
+
+random.seed({seed})
+np.random.seed({seed})
+torch.manual_seed(0)
+
+x = torch.rand(64, 200)
+augs = [FractalTimeDropout(0.5), FractalTimeStretch(0.5, intra_ratio=0.5)]
+print([float(aug(x).sum()) for aug in augs for _ in range(8)])
+"""
+
+
+def _seeded_run(seed):
+    result = subprocess.run([sys.executable, '-c', _SEEDED_RUN.format(seed=seed)],
+                            capture_output=True, text=True, check=True)
+    return result.stdout
+
+
+def test_torch_seed_makes_augmentation_reproducible():
+    # the python and numpy global seeds must not matter
+    assert _seeded_run(1) == _seeded_run(2)
+
+
+def test_torch_seed_change_resets_the_stream():
+    aug = FractalTimeDropout(1.0)
+
+    torch.manual_seed(0)
+    first = aug.rng.integers(0, 2**31, size=8)
+    torch.manual_seed(1)
+    assert not np.array_equal(aug.rng.integers(0, 2**31, size=8), first)
+
+
+class _Tag(torch.nn.Module):
+    """Append its name to the trace given as input."""
+    def __init__(self, name, stage=None):
+        super().__init__()
+        self.name = name
+        self.stage = stage
+
+    def forward(self, trace):
+        return trace + [self.name]
+
+
+def _traces(pool, process):
+    compose = ComposeAugmentation(
+        pre_process_rule=lambda aug: aug.stage in ('pre', 'both'),
+        post_process_rule=lambda aug: aug.stage in ('post', 'both'),
+    )
+    compose.set_augmentation_pool(pool)
+    compose.set_process(process)
+    return [pipeline([]) for pipeline in compose._composed]
+
+
+def test_compose_places_augmentations_in_their_stage():
+    traces = _traces([_Tag('a', 'pre'), _Tag('b', 'post'), _Tag('c')], [_Tag('p')])
+
+    assert traces == [['a', 'p'], ['p', 'b'], ['p']]
+
+
+def test_compose_rebuilds_pipelines_on_set_process():
+    compose = ComposeAugmentation(lambda aug: True, lambda aug: False)
+    compose.set_process([_Tag('p1')])
+    compose.set_augmentation_pool([_Tag('a')])
+    assert compose([]) == ['a', 'p1']
+
+    compose.set_process(_Tag('p2'))
+    assert compose([]) == ['a', 'p2']
+
+
+def test_compose_pre_process_rule_takes_precedence():
+    traces = _traces([_Tag('a', 'both')], [_Tag('p')])
+
+    assert traces == [['a', 'p']]
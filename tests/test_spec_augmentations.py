@@ -0,0 +1,132 @@
+import numpy as np
+import pytest
+import torch
+import torch.nn.functional as F
+
+import augmentation_utils.spec_augmentations as spec
+from augmentation_utils.spec_augmentations import _stretch_chunks
+
+
+@pytest.mark.parametrize('mode', ['nearest', 'bilinear', 'bicubic'])
+def test_stretch_chunks_matches_per_chunk_interpolate(monkeypatch, mode):
+    monkeypatch.setattr(spec, 'random_interpolation', lambda rng: mode)
+
+    x = torch.randn(2, 16, 100, dtype=torch.float64)
+    chunks_width = np.array([7, 13, 5, 21, 9, 30, 15])
+    stretch_mask = np.array([True, True, False, True, True, True, False])
+    rates = np.full(len(chunks_width), 6 / 7)
+    rates[3] = 1.2
+
+    expected = []
+    offset = 0
+    for width, stretch, rate in zip(chunks_width, stretch_mask, rates):
+        chunk = x[..., offset:offset+width]
+        if stretch:
+            chunk = F.interpolate(chunk[None], scale_factor=(1.0, rate), recompute_scale_factor=False, mode=mode)[0]
+        expected.append(chunk)
+        offset += width
+
+    expected = torch.cat(expected, dim=-1)
+    assert torch.allclose(_stretch_chunks(np.random.default_rng(0), x, chunks_width, stretch_mask, rates), expected)
+
+
+def test_stretch_chunks_identity():
+    x = torch.randn(16, 100)
+    chunks_width = np.array([10, 20, 30, 45])
+    assert torch.allclose(_stretch_chunks(np.random.default_rng(0), x, chunks_width, np.ones(4, bool), np.ones(4)), x)
+
+
+@pytest.mark.parametrize('aug_cls', [
+    spec.RandomTimeDropout, spec.RandomFreqDropout,
+    spec.FractalTimeDropout, spec.FractalFrecDropout,
+])
+def test_dropouts_draw_one_mask_per_spectrogram(aug_cls):
+    x = torch.rand(8, 64, 200)
+    y = aug_cls(1.0, fill_value=-1.0)(x)
+
+    dropped = y == -1.0
+    assert dropped.any()
+    assert not all(torch.equal(dropped[0], dropped[i]) for i in range(1, len(x)))
+
+
+@pytest.mark.parametrize('ratio, low, high', [(0.0, 0.0, 0.0), (0.5, 0.4, 0.6)])
+def test_compiled_augmentation_respects_ratio(ratio, low, high):
+    torch.manual_seed(0)
+    x = torch.arange(6.).view(2, 3)
+    pipeline = torch.compile(torch.nn.Sequential(spec.HorizontalFlip(ratio)), dynamic=True, fullgraph=False)
+
+    applied = sum(not torch.equal(pipeline(x), x) for _ in range(400)) / 400
+    assert low <= applied <= high
+
+
+@pytest.mark.parametrize('shape', [(64, 3), (1, 1), (5, 3), (64, 1), (3, 64), (2, 1, 1)])
+@pytest.mark.parametrize('aug_cls', [spec.FractalTimeStretch, spec.FractalFreqStretch])
+def test_stretch_small_axis(aug_cls, shape):
+    x = torch.rand(*shape)
+    aug = aug_cls(1.0, intra_ratio=1.0, rate=(0.5, 0.9))
+    for _ in range(20):
+        assert aug(x).shape == x.shape
+
+
+def test_stretch_chunks_keeps_one_line_per_chunk():
+    x = torch.randn(4, 6)
+    chunks_width = np.ones(6, dtype=int)
+    stretched = _stretch_chunks(np.random.default_rng(0), x, chunks_width, np.ones(6, bool), np.full(6, 0.8))
+    assert torch.equal(stretched, x)
+
+
+@pytest.mark.parametrize('dtype', [torch.float32, torch.float64, torch.float16, torch.bfloat16])
+@pytest.mark.parametrize('aug_cls', [spec.FractalTimeStretch, spec.FractalFreqStretch, spec.FractalStretch])
+def test_stretch_keeps_dtype(aug_cls, dtype):
+    x = torch.rand(64, 100).to(dtype)
+    y = aug_cls(1.0)(x)
+    assert y.shape == x.shape and y.dtype == dtype
+
+
+@pytest.mark.parametrize('min_chunk_size, max_chunk_size', [(3, 10), (1, 2), (0, 3)])
+def test_draw_drop_masks_drops_whole_chunks(min_chunk_size, max_chunk_size):
+    rng = np.random.default_rng(0)
+    masks = spec._draw_drop_masks(rng, 64, 50, min_chunk_size, max_chunk_size, 1, 3)
+
+    assert masks.shape == (64, 50)
+    if min_chunk_size > 0:
+        # a zero-width chunk can be picked otherwise
+        assert masks.any(axis=1).all()
+
+    # at most 3 dropped chunks, each narrower than max_chunk_size
+    for mask in masks:
+        edges = np.flatnonzero(np.diff(np.concatenate(([0], mask.astype(int), [0]))))
+        runs = edges[1::2] - edges[::2]
+        assert runs.sum() <= 3 * (max_chunk_size - 1)
+
+
+@pytest.mark.parametrize('dim', [1, 2])
+def test_drop_stripes_width_and_axis(dim):
+    drop_width = 5
+    dropper = spec.DropStripes(dim=dim, drop_width=drop_width, stripes_num=1)
+    x = dropper(torch.ones(32, 20, 30))
+
+    # reduce over the other axis: dropped lines are entirely zero
+    other = 3 - dim
+    line_dropped = (x == 0).all(dim=other)
+    assert torch.equal(line_dropped, (x == 0).any(dim=other))
+
+    # a single stripe is one contiguous run narrower than drop_width
+    for lines in line_dropped:
+        idx = torch.nonzero(lines).flatten()
+        assert len(idx) < drop_width
+        if len(idx) > 0:
+            assert idx[-1] - idx[0] + 1 == len(idx)
+
+
+def test_spec_augment_scripted_matches_eager():
+    x = torch.rand(4, 20, 30)
+    scripted = spec.SpecAugment.scripted(8, 2, 4, 2)
+    eager = spec.SpecAugment(8, 2, 4, 2)
+
+    assert scripted(x.clone()).shape == eager(x.clone()).shape == x.shape
+
+    scripted.eval()
+    eager.eval()
+    assert torch.equal(scripted(x.clone()), x)
+    assert torch.equal(eager(x.clone()), x)